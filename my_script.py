@@ -1,17 +1,72 @@
 import argparse
+import asyncio
+import hashlib
 import json
 import os
 import re
+import shutil
+import socket
 import subprocess
 import sys
 import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 import logging
 
 import google.generativeai as genai
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pptx import Presentation
+from pptx.shapes.graphfrm import GraphicFrame
+from pptx.shapes.group import GroupShape
+from pptx.shapes.picture import Picture
+
+# Run each Tesseract single-threaded; OCR is parallelised across processes instead
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
 import pytesseract
+try:
+    from tesserocr import OEM, PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Upper bound on images per Tesseract file-list run; larger lists can stall pytesseract's pipes
+OCR_BATCH_SIZE = 50
+
+# Resolution for slide rasterization; 150 DPI is plenty for slide-sized text
+RENDER_DPI = 150
+
+# How long to wait for a freshly started LibreOffice listener to accept connections
+OFFICE_STARTUP_TIMEOUT = 30
+
+# Repo-local copy of the LSTM models from https://github.com/tesseract-ocr/tessdata_fast
+TESSDATA_FAST_DIR = Path(__file__).resolve().parent / "tessdata_fast"
+
+# Skip Tesseract's second pass over inverted text; slides are dark-on-light
+TESSERACT_VARIABLES = {"tessedit_do_invert": "0"}
+
+# Markdown code block around a JSON payload, with an optional "json" tag
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.DOTALL | re.IGNORECASE)
+
+GEMINI_MODEL = "gemini-1.5-flash-latest"
+
+# Larger prompts are split into overlapping slide windows that are analysed concurrently
+MAX_PROMPT_CHARS = 1000000
+WINDOW_OVERLAP = 5
+
+# Gemini results keyed by a hash of the full prompt, so unchanged decks skip the API call
+CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "pptx_checker"
+
+# Separate LibreOffice profile for the persistent listener, so one-shot
+# conversions are never handed to the running instance
+OFFICE_PROFILE_DIR = (CACHE_DIR / "lo_profile").resolve()
+
+# Per-process Tesseract engine and pytesseract options, set once by init_ocr_worker
+_ocr_api = None
+_tesseract_config = ""
 
 def setup_logging(debug=False):
     """Configure logging based on debug flag"""
@@ -21,11 +76,21 @@ def setup_logging(debug=False):
         level=level
     )
 
+def shape_has_image(shape):
+    """Whether a shape may hold text python-pptx cannot read (pictures, charts, tables, SmartArt)"""
+    if isinstance(shape, GroupShape):
+        return any(shape_has_image(child) for child in shape.shapes)
+    return isinstance(shape, (Picture, GraphicFrame))
+
 def extract_pptx_text(pptx_path, debug=False):
-    """Extract text from PowerPoint slides and notes"""
+    """Extract text from PowerPoint slides and notes, flagging slides that need OCR
+    and mapping each slide to its exported PDF page (None for hidden slides)"""
     logging.info(f"Extracting text from PPTX: {pptx_path}")
     presentation = Presentation(pptx_path)
     slide_texts = []
+    has_image = []
+    pdf_pages = []
+    pdf_page = 0
     
     for i, slide in enumerate(presentation.slides):
         if debug:
@@ -33,21 +98,27 @@ def extract_pptx_text(pptx_path, debug=False):
         slide_content = []
         
         # Extract slide title
-        title = slide.shapes.title.text if slide.shapes.title else ""
+        shapes = slide.shapes
+        title_shape = shapes.title
+        title = title_shape.text if title_shape else ""
         if title:
             slide_content.append(f"Title: {title}")
         
-        # Extract content from shapes
-        for shape in slide.shapes:
+        # Extract content from shapes, noting image-like shapes in the same pass
+        slide_has_image = False
+        for shape in shapes:
             if shape.has_text_frame:
                 for paragraph in shape.text_frame.paragraphs:
-                    text = "".join(run.text for run in paragraph.runs)
+                    text = "".join([run.text for run in paragraph.runs])
                     if text.strip():
                         slide_content.append(text)
+            elif not slide_has_image and shape_has_image(shape):
+                slide_has_image = True
         
         # Extract notes
-        if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
-            notes = slide.notes_slide.notes_text_frame.text.strip()
+        notes_frame = slide.notes_slide.notes_text_frame if slide.has_notes_slide else None
+        if notes_frame:
+            notes = notes_frame.text.strip()
             if notes:
                 slide_content.append(f"Notes: {notes}")
         
@@ -56,71 +127,184 @@ def extract_pptx_text(pptx_path, debug=False):
             logging.debug(f"Slide {i+1} text:\n{slide_text}\n{'-'*40}")
         
         slide_texts.append(slide_text)
+        has_image.append(slide_has_image)
+        
+        # LibreOffice leaves hidden slides out of the PDF, shifting later page numbers
+        if slide._element.get("show") == "0":
+            pdf_pages.append(None)
+        else:
+            pdf_page += 1
+            pdf_pages.append(pdf_page)
     
-    return slide_texts
-
-def convert_pptx_to_images(pptx_path, poppler_path=None, debug=False):
-    """Convert PPTX to images using LibreOffice"""
-    logging.info("Converting PPTX to images...")
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        # Convert PPTX to PDF
-        pdf_path = Path(tmp_dir) / "temp.pdf"
-        try:
-            # Convert all paths to strings for the command
-            cmd = [
-                "libreoffice", "--headless", "--convert-to", "pdf", 
-                "--outdir", tmp_dir, str(pptx_path)
+    return slide_texts, has_image, pdf_pages
+
+def office_connection(port):
+    """UNO connection string for a LibreOffice listener on localhost"""
+    return f"socket,host=localhost,port={port};urp;StarOffice.ComponentContext"
+
+def office_listening(port):
+    """Check whether something accepts connections on the listener port"""
+    try:
+        with socket.create_connection(("localhost", port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+def start_office_listener(port, debug=False):
+    """Launch a headless LibreOffice listener on port unless one is already running, without waiting for it"""
+    if office_listening(port):
+        return True
+    
+    cmd = [
+        "libreoffice", "--headless", "--invisible", "--nologo", "--norestore",
+        "--nofirststartwizard", f"-env:UserInstallation={OFFICE_PROFILE_DIR.as_uri()}",
+        f"--accept={office_connection(port)}"
+    ]
+    if debug:
+        logging.debug(f"Starting LibreOffice listener: {' '.join(cmd)}")
+    try:
+        # Detach so the listener outlives this run and later runs reuse it
+        subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except FileNotFoundError as e:
+        logging.warning(f"Could not start LibreOffice listener: {str(e)}")
+        return False
+    return True
+
+def wait_for_office_listener(port):
+    """Wait until the listener on port accepts connections"""
+    deadline = time.monotonic() + OFFICE_STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if office_listening(port):
+            return True
+        time.sleep(0.2)
+    logging.warning(f"LibreOffice listener did not come up on port {port}")
+    return False
+
+def render_pdf_page(pdf_path, page, out_dir, poppler_path=None):
+    """Rasterize a single PDF page (1-indexed) to a PNG file in out_dir with poppler"""
+    return convert_from_path(
+        str(pdf_path),
+        dpi=RENDER_DPI,
+        grayscale=True,
+        fmt="png",
+        first_page=page,
+        last_page=page,
+        output_folder=str(out_dir),
+        output_file=f"page_{page}",
+        paths_only=True,
+        poppler_path=poppler_path
+    )
+
+def run_office_command(cmd, debug=False):
+    """Run a LibreOffice conversion command, raising CalledProcessError on failure"""
+    if debug:
+        # Convert all command elements to strings for logging
+        cmd_str = " ".join(str(item) for item in cmd)
+        logging.debug(f"Running command: {cmd_str}")
+    
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    
+    if debug:
+        if result.stdout:
+            logging.debug(f"LibreOffice stdout: {result.stdout}")
+        if result.stderr:
+            logging.debug(f"LibreOffice stderr: {result.stderr}")
+    
+    result.check_returncode()
+
+def convert_pptx_to_pdf(pptx_path, out_dir, office_port=None, listener_ready=False, debug=False):
+    """Convert PPTX to a PDF in out_dir using LibreOffice, returning its path or None"""
+    logging.info("Converting PPTX to PDF...")
+    # Convert PPTX to PDF (LibreOffice names the output after the input file).
+    # LibreOffice's PNG export only renders the first slide of a deck, so the
+    # PDF step is needed to get one image per slide.
+    pdf_path = Path(out_dir) / f"{Path(pptx_path).stem}.pdf"
+    
+    # Convert all paths to strings for the command
+    oneshot_cmd = [
+        "libreoffice", "--headless", "--convert-to", "pdf", 
+        "--outdir", str(out_dir), str(pptx_path)
+    ]
+    try:
+        # Reuse a running LibreOffice when one is ready, avoiding its cold start
+        if office_port and listener_ready:
+            listener_cmd = [
+                "unoconv", "--connection", office_connection(office_port),
+                "-f", "pdf", "-o", str(pdf_path), str(pptx_path)
             ]
-            if debug:
-                # Convert all command elements to strings for logging
-                cmd_str = " ".join(str(item) for item in cmd)
-                logging.debug(f"Running command: {cmd_str}")
-            
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            if debug:
-                if result.stdout:
-                    logging.debug(f"LibreOffice stdout: {result.stdout}")
-                if result.stderr:
-                    logging.debug(f"LibreOffice stderr: {result.stderr}")
-            
-            result.check_returncode()
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            logging.warning(f"PPTX to PDF conversion failed: {str(e)}")
-            if debug:
-                if 'result' in locals():
-                    logging.debug(f"Error details: {result.stderr}")
-            return []
-        
-        # Convert PDF to images
-        if pdf_path.exists():
             try:
+                run_office_command(listener_cmd, debug)
+            except subprocess.CalledProcessError as e:
+                logging.warning(f"Conversion through the listener failed ({str(e)}) - retrying with a one-off LibreOffice")
                 if debug:
-                    logging.debug(f"Converting PDF to images with poppler_path={poppler_path}")
-                
-                images = convert_from_path(
-                    str(pdf_path),
-                    dpi=200,
-                    poppler_path=poppler_path
-                )
-                return images
-            except Exception as e:
-                logging.error(f"PDF to image conversion error: {str(e)}")
-                return []
+                    logging.debug(f"Error details: {e.stderr}")
+                run_office_command(oneshot_cmd, debug)
         else:
-            logging.warning(f"PDF not created: {pdf_path}")
-            return []
-    return []
+            run_office_command(oneshot_cmd, debug)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        logging.warning(f"PPTX to PDF conversion failed: {str(e)}")
+        if debug and isinstance(e, subprocess.CalledProcessError):
+            logging.debug(f"Error details: {e.stderr}")
+        return None
+    
+    if not pdf_path.exists():
+        logging.warning(f"PDF not created: {pdf_path}")
+        return None
+    return pdf_path
+
+def default_tessdata_dir():
+    """Use the bundled fast models when they have been downloaded"""
+    if (TESSDATA_FAST_DIR / "eng.traineddata").exists():
+        return TESSDATA_FAST_DIR
+    return None
+
+def tesseract_config(tessdata_dir=None):
+    """pytesseract options matching the tesserocr engine setup"""
+    options = []
+    if tessdata_dir:
+        options.append(f'--tessdata-dir "{tessdata_dir}"')
+    options.append("--oem 1")
+    options.extend(f"-c {name}={value}" for name, value in TESSERACT_VARIABLES.items())
+    return " ".join(options)
+
+def init_ocr_worker(tessdata_dir=None):
+    """Load Tesseract once per worker so its language data stays resident"""
+    global _ocr_api, _tesseract_config
+    _tesseract_config = tesseract_config(tessdata_dir)
+    if PyTessBaseAPI is None:
+        return
+    try:
+        kwargs = {"path": str(tessdata_dir)} if tessdata_dir else {}
+        _ocr_api = PyTessBaseAPI(
+            lang="eng",
+            oem=OEM.LSTM_ONLY,
+            variables=TESSERACT_VARIABLES,
+            **kwargs
+        )
+    except RuntimeError as e:
+        logging.warning(f"tesserocr initialisation failed, falling back to pytesseract: {str(e)}")
 
-def extract_image_text(image, debug=False):
-    """Perform OCR on images using Tesseract"""
+def extract_image_text(image, api=None, debug=False):
+    """Perform OCR on an image file using Tesseract"""
+    if api is None:
+        api = _ocr_api
     try:
-        text = pytesseract.image_to_string(image)
+        # Hand Tesseract the file path so the PNG is read once, without a PIL round trip
+        if api is not None:
+            api.SetImageFile(str(image))
+            text = api.GetUTF8Text()
+        else:
+            text = pytesseract.image_to_string(str(image), config=_tesseract_config)
         if debug and text.strip():
             logging.debug(f"Extracted image text:\n{text}\n{'-'*40}")
         return text
@@ -128,7 +312,203 @@ def extract_image_text(image, debug=False):
         logging.error(f"OCR Error: {str(e)}")
         return ""
 
-def analyze_with_gemini(slide_texts, api_key, debug=False):
+def extract_batch_text(image_paths, list_path, debug=False):
+    """OCR several images in a single Tesseract run via its file-list input"""
+    Path(list_path).write_text("".join(f"{path}\n" for path in image_paths))
+    try:
+        text = pytesseract.image_to_string(str(list_path), config=_tesseract_config)
+    except Exception as e:
+        logging.error(f"OCR Error: {str(e)}")
+        return [""] * len(image_paths)
+    
+    # Tesseract terminates every page with a form feed
+    pages = text.split("\f")[:len(image_paths)]
+    pages += [""] * (len(image_paths) - len(pages))
+    if debug:
+        for path, page in zip(image_paths, pages):
+            if page.strip():
+                logging.debug(f"Extracted image text from {Path(path).name}:\n{page}\n{'-'*40}")
+    return pages
+
+def ocr_image_files(image_paths, list_path, debug=False):
+    """OCR image files in a worker, one at a time with tesserocr or as one Tesseract batch"""
+    if _ocr_api is not None or len(image_paths) == 1:
+        return [extract_image_text(path, debug=debug) for path in image_paths]
+    return extract_batch_text(image_paths, list_path, debug)
+
+def ocr_pdf_pages(pdf_path, pages, out_dir, poppler_path=None, tessdata_dir=None, debug=False):
+    """Render and OCR 1-indexed PDF pages on one worker pool, returning {page: text}"""
+    try:
+        page_count = pdfinfo_from_path(str(pdf_path), poppler_path=poppler_path)["Pages"]
+    except Exception as e:
+        logging.error(f"PDF to image conversion error: {str(e)}")
+        return {}
+    pages = [page for page in pages if page <= page_count]
+    if not pages:
+        return {}
+    logging.info(f"Rendering and extracting text from {len(pages)} slide images")
+    
+    # With tesserocr each page is OCRed on its own; without it, pages are grouped
+    # so each Tesseract run amortises its start-up over a file list
+    workers = os.cpu_count() or 1
+    if PyTessBaseAPI is not None:
+        batch_size = 1
+    else:
+        batch_size = min(OCR_BATCH_SIZE, -(-len(pages) // workers))
+    batches = [pages[i:i + batch_size] for i in range(0, len(pages), batch_size)]
+    batch_index = {page: i for i, batch in enumerate(batches) for page in batch}
+    unrendered = [len(batch) for batch in batches]
+    image_paths = {}
+    texts = {}
+    
+    # A crashed worker (segfault, OOM kill) breaks the whole pool; keep whatever
+    # text was already extracted and let the rest fall back to structured text
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_ocr_worker,
+            initargs=(tessdata_dir,)
+        ) as executor:
+            pending_pages = iter(pages)
+            futures = {}
+        
+            def submit_render():
+                page = next(pending_pages, None)
+                if page is not None:
+                    future = executor.submit(render_pdf_page, pdf_path, page, out_dir, poppler_path)
+                    futures[future] = ("render", page)
+        
+            # Keep at most one render per worker in flight so OCR jobs queue
+            # between renders instead of behind all of them
+            for _ in range(workers):
+                submit_render()
+        
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, item = futures.pop(future)
+                    if kind == "ocr":
+                        try:
+                            texts.update(zip(item, future.result()))
+                        except Exception as e:
+                            logging.error(f"OCR Error on pages {item}: {str(e)}")
+                        continue
+                
+                    try:
+                        image_paths[item] = future.result()[0]
+                    except Exception as e:
+                        logging.error(f"PDF to image conversion error on page {item}: {str(e)}")
+                
+                    # Queue a batch's OCR as soon as all of its pages are rendered
+                    index = batch_index[item]
+                    unrendered[index] -= 1
+                    if unrendered[index] == 0:
+                        batch = [page for page in batches[index] if page in image_paths]
+                        if batch:
+                            ocr_future = executor.submit(
+                                ocr_image_files,
+                                [image_paths[page] for page in batch],
+                                Path(out_dir) / f"images_{index}.txt",
+                                debug
+                            )
+                            futures[ocr_future] = ("ocr", batch)
+                    submit_render()
+    except BrokenExecutor as e:
+        logging.error(f"OCR worker pool failed, continuing with {len(texts)} OCRed pages: {str(e)}")
+    
+    return texts
+
+def load_json(text):
+    """Parse JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def dump_json(data):
+    """Serialize to indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def load_cached_result(key):
+    """Return a cached Gemini result, or None on a cache miss"""
+    try:
+        return load_json((CACHE_DIR / f"{key}.json").read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def save_cached_result(key, result):
+    """Atomically store a Gemini result in the cache"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(dump_json(result))
+        os.replace(tmp_path, CACHE_DIR / f"{key}.json")
+    except OSError as e:
+        logging.warning(f"Could not write Gemini cache: {str(e)}")
+
+def split_slide_windows(slide_texts):
+    """Group slides into (context_start, start, end) windows that each fit in one prompt"""
+    windows = []
+    start = 0
+    while start < len(slide_texts):
+        # Repeat the tail of the previous window so neighbouring slides are still
+        # compared, dropping context slides until the first new slide fits too
+        context_start = max(0, start - WINDOW_OVERLAP)
+        size = sum(len(text) for text in slide_texts[context_start:start])
+        while context_start < start and size + len(slide_texts[start]) > MAX_PROMPT_CHARS:
+            size -= len(slide_texts[context_start])
+            context_start += 1
+        end = start
+        while end < len(slide_texts) and (end == start or size + len(slide_texts[end]) <= MAX_PROMPT_CHARS):
+            size += len(slide_texts[end])
+            end += 1
+        windows.append((context_start, start, end))
+        start = end
+    return windows
+
+async def request_gemini(model, system_instruction, slide_content, use_cache=True, debug=False):
+    """Send one prompt to Gemini, streaming the response and caching the parsed result"""
+    if debug:
+        # Truncate for logging
+        truncated = slide_content[:1000] + '... [truncated]' if len(slide_content) > 1000 else slide_content
+        logging.debug(f"Sending to Gemini (truncated):\n{truncated}")
+    
+    prompt = "\0".join((GEMINI_MODEL, system_instruction, slide_content))
+    cache_key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    if use_cache:
+        cached = load_cached_result(cache_key)
+        if cached is not None:
+            logging.info("Using cached Gemini result (pass --no-cache to refresh)")
+            return cached
+    
+    try:
+        # Stream the response so chunks arrive while the model is still generating
+        chunks = []
+        response = await model.generate_content_async(slide_content, stream=True)
+        async for chunk in response:
+            # chunk.text raises on chunks without parts (finish/usage or safety stops)
+            if not chunk.parts:
+                continue
+            text = "".join(part.text for part in chunk.parts)
+            chunks.append(text)
+            if debug:
+                logging.debug(f"Gemini chunk: {text}")
+        response_text = "".join(chunks)
+        
+        if debug:
+            logging.debug(f"Gemini raw response: {response_text}")
+        
+        results = extract_json(response_text, debug)
+        if use_cache and not (isinstance(results, dict) and "error" in results):
+            save_cached_result(cache_key, results)
+        return results
+    except Exception as e:
+        logging.error(f"Gemini API error: {str(e)}")
+        return {"error": str(e)}
+
+async def analyze_with_gemini(slide_texts, api_key, use_cache=True, debug=False):
     """Detect inconsistencies using Gemini"""
     logging.info("Analyzing content with Gemini...")
     system_instruction = (
@@ -146,60 +526,66 @@ def analyze_with_gemini(slide_texts, api_key, debug=False):
         "Only include findings with confidence > 0.5. "
         "Reference slide numbers explicitly in descriptions."
     )
+    model = genai.GenerativeModel(
+        GEMINI_MODEL,
+        system_instruction=system_instruction
+    )
     
-    # Build the slide content string
-    parts = []
-    for i, text in enumerate(slide_texts):
-        parts.append(f"--- Slide {i+1} ---\n{text}")
-    slide_content = "\n\n".join(parts)
-    
-    if debug:
-        # Truncate for logging
-        truncated = slide_content[:1000] + '... [truncated]' if len(slide_content) > 1000 else slide_content
-        logging.debug(f"Sending to Gemini (truncated):\n{truncated}")
+    # Build one slide content string per window, keeping absolute slide numbers
+    windows = split_slide_windows(slide_texts)
+    if len(windows) > 1:
+        logging.info(f"Presentation too large for one prompt - analyzing {len(windows)} slide windows concurrently")
+    prompts = [
+        "\n\n".join([
+            f"--- Slide {i+1} ---\n{slide_texts[i]}" for i in range(context_start, end)
+        ])
+        for context_start, start, end in windows
+    ]
+    responses = await asyncio.gather(*[
+        request_gemini(model, system_instruction, prompt, use_cache, debug) for prompt in prompts
+    ])
+    if len(responses) == 1:
+        return responses[0]
     
-    try:
-        model = genai.GenerativeModel(
-            "gemini-1.5-flash-latest",
-            system_instruction=system_instruction
-        )
-        
-        response = model.generate_content(slide_content)
-        
-        if debug:
-            logging.debug(f"Gemini raw response: {response.text}")
-        
-        return extract_json(response.text, debug)
-    except Exception as e:
-        logging.error(f"Gemini API error: {str(e)}")
-        return {"error": str(e)}
+    # Merge window results, dropping findings that sit entirely in a window's
+    # overlap, since the previous window already covered those slides
+    results = []
+    failures = []
+    for (context_start, start, end), response in zip(windows, responses):
+        if not isinstance(response, list):
+            logging.error(f"Analysis of slides {context_start+1}-{end} failed - keeping results from other windows")
+            failures.append(response)
+            continue
+        for issue in response:
+            slide_numbers = issue.get("slide_numbers") if isinstance(issue, dict) else None
+            if isinstance(slide_numbers, list) and slide_numbers and \
+                    all(isinstance(n, int) for n in slide_numbers) and max(slide_numbers) <= start:
+                continue
+            results.append(issue)
+    if len(failures) == len(windows):
+        return failures[0]
+    return results
 
 def extract_json(text, debug=False):
     """Extract JSON from Gemini response with better handling of code blocks"""
     try:
         # Try to parse directly first
-        return json.loads(text)
+        return load_json(text)
     except json.JSONDecodeError:
         try:
             # Handle code block format (```json ... ```)
-            if text.strip().startswith('```'):
-                # Extract content between the first and last triple backticks
-                parts = text.split('```')
-                if len(parts) >= 3:
-                    json_content = parts[1]
-                    # Remove optional "json" specifier
-                    if json_content.lower().startswith('json'):
-                        json_content = json_content[4:].lstrip()
-                    return json.loads(json_content)
+            match = _FENCE_RE.search(text)
+            if match:
+                return load_json(match.group(1))
             
             # Try to find first JSON structure
-            for i, char in enumerate(text):
-                if char in {'[', '{'}:
-                    return json.loads(text[i:])
+            starts = [i for i in (text.find('['), text.find('{')) if i >= 0]
+            if starts:
+                return load_json(text[min(starts):])
             
             # If all else fails, try to clean the whole text
-            cleaned = re.sub(r'[^\x00-\x7F]+', '', text)  # Remove non-ASCII
-            return json.loads(cleaned)
+            cleaned = text.encode('ascii', 'ignore').decode('ascii')  # Remove non-ASCII
+            return load_json(cleaned)
         except Exception as e:
             if debug:
                 logging.debug(f"JSON extraction failed: {str(e)}")
@@ -213,6 +599,10 @@ def main():
     parser.add_argument("--output", default="results.json", help="Output JSON file path")
     parser.add_argument("--poppler", help="Path to Poppler bin directory")
     parser.add_argument("--api-key", help="Gemini API key")
+    parser.add_argument("--office-port", type=int, help="Convert through a persistent LibreOffice listener on this port (requires unoconv)")
+    parser.add_argument("--tessdata-dir", help="Tesseract model directory (defaults to ./tessdata_fast when present)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call Gemini instead of reusing cached results")
+    parser.add_argument("--force-ocr", action="store_true", help="Render and OCR every slide, including text-only ones")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
 
@@ -236,25 +626,60 @@ def main():
     if os.name == 'nt' and not os.getenv('TESSDATA_PREFIX'):
         logging.warning("TESSDATA_PREFIX environment variable not set - Tesseract might not work properly")
 
-    # Process PPTX
-    structured_text = extract_pptx_text(pptx_path, args.debug)
+    use_listener = bool(args.office_port)
+    if use_listener and not shutil.which("unoconv"):
+        logging.warning("unoconv not found - starting a one-off LibreOffice instead of the listener")
+        use_listener = False
     
-    # Convert to images and extract OCR text
-    slide_images = convert_pptx_to_images(
-        pptx_path, 
-        poppler_path=args.poppler,
-        debug=args.debug
-    )
+    # Process PPTX, launching the LibreOffice listener (if requested) at the same time.
+    # Only the launch happens here; waiting for it is left to the OCR branch below.
+    listener_started = False
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        text_future = executor.submit(extract_pptx_text, pptx_path, args.debug)
+        listener_future = None
+        if use_listener:
+            listener_future = executor.submit(start_office_listener, args.office_port, args.debug)
+        structured_text, has_image, pdf_pages = text_future.result()
+        if listener_future:
+            listener_started = listener_future.result()
     
-    ocr_texts = []
-    if slide_images:
-        logging.info(f"Extracting text from {len(slide_images)} slide images")
-        for i, img in enumerate(slide_images):
-            ocr_text = extract_image_text(img, args.debug)
-            ocr_texts.append(ocr_text)
+    # Only slides with pictures, charts or tables can hold text python-pptx missed
+    ocr_texts = [""] * len(structured_text)
+    ocr_slides = {
+        pdf_pages[i]: i for i, flag in enumerate(has_image)
+        if (flag or args.force_ocr) and pdf_pages[i] is not None
+    }
+    ocr_pages = sorted(ocr_slides)
+    if not ocr_pages:
+        logging.info("No slides contain images - skipping image conversion and OCR")
     else:
-        logging.warning("No slide images generated - using only structured text")
-        ocr_texts = [""] * len(structured_text)
+        # Convert to PDF, then render and OCR the selected pages; files live until OCR is done
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            listener_ready = listener_started and wait_for_office_listener(args.office_port)
+            pdf_path = convert_pptx_to_pdf(
+                pptx_path, 
+                tmp_dir,
+                office_port=args.office_port,
+                listener_ready=listener_ready,
+                debug=args.debug
+            )
+            
+            page_texts = {}
+            if pdf_path:
+                page_texts = ocr_pdf_pages(
+                    pdf_path,
+                    ocr_pages,
+                    tmp_dir,
+                    poppler_path=args.poppler,
+                    tessdata_dir=args.tessdata_dir or default_tessdata_dir(),
+                    debug=args.debug
+                )
+            
+            if page_texts:
+                for page, text in page_texts.items():
+                    ocr_texts[ocr_slides[page]] = text
+            else:
+                logging.warning("No slide images generated - using only structured text")
     
     # Combine structured and OCR text
     combined_text = []
@@ -265,11 +690,11 @@ def main():
             logging.debug(f"Slide {i+1} combined text:\n{combined[:500]}...\n{'-'*40}")
     
     # Analyze with Gemini
-    results = analyze_with_gemini(combined_text, api_key, args.debug)
+    results = asyncio.run(analyze_with_gemini(combined_text, api_key, not args.no_cache, args.debug))
     
     # Save results
-    with open(args.output, "w") as f:
-        json.dump(results, f, indent=2)
+    with open(args.output, "wb") as f:
+        f.write(dump_json(results))
     
     logging.info(f"Analysis complete. Results saved to {args.output}")
     